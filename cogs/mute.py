@@ -1,6 +1,16 @@
 import discord
 from discord.ext import commands
-import traceback
+import asyncio
+import logging
+import io
+import os
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse # For parsing DATABASE_URL
+
+import psycopg2
+
+log = logging.getLogger(__name__)
 
 # --- Configuration ---
 MEDIA_MUTE_ROLE_NAME = "Media Muted"
@@ -14,6 +24,60 @@ PERMISSIONS_TO_DENY = {
     # "send_messages": False,
     # "send_messages_in_threads": False,
 }
+# Post a notice in the system channel when the role is auto-created (one extra API call)
+NOTIFY_SYSTEM_CHANNEL_ON_CREATE = True
+MUTED_LIST_PAGE_CHARS = 3900 # Max description length per `mutedlist` embed (Discord allows 4096)
+AUDIT_REASON_MAX = 512 # Discord rejects longer X-Audit-Log-Reason headers
+ERROR_TEMPLATE_CACHE_SIZE = 128 # Cached error embed templates kept by the cog
+BULK_MUTE_CONCURRENCY = 5 # Max role edits `mutemany` keeps in flight at once
+# Built once at import: bitmask of the denied permissions and the channel overwrite that denies them
+_DENY_MASK = discord.Permissions(**{perm_name: True for perm_name in PERMISSIONS_TO_DENY}).value
+_DESIRED_OVERWRITE = discord.PermissionOverwrite(**PERMISSIONS_TO_DENY)
+_DESIRED_OVERWRITE_PAIR = _DESIRED_OVERWRITE.pair()
+# Replies never ping: mentions in moderation responses are for display only
+_SAFE_MENTIONS = discord.AllowedMentions.none()
+
+# (error type, description builder) pairs shared by the mute/unmute error handlers, checked in order
+_ERROR_DESCRIPTIONS = (
+    (commands.CommandOnCooldown, lambda e: f"Command on cooldown. Try again in {e.retry_after:.2f}s."),
+    (commands.MissingPermissions, lambda e: "You need 'Moderate Members' permission."),
+    (commands.BotMissingPermissions, lambda e: f"I'm missing 'Manage Roles' permission. (Missing: {', '.join(e.missing_permissions)})"),
+    (commands.MemberNotFound, lambda e: f"Member '{e.argument}' not found."),
+    (commands.MissingRequiredArgument, lambda e: f"Missing argument: {e.param.name}."),
+)
+
+# Response text, formatted once at import; `{member}` placeholders are filled per call with .format()
+MESSAGES = {
+    "owner": "The server owner cannot be muted.",
+    "self": "You cannot mute yourself.",
+    "bot": "Bots cannot be muted with this command.",
+    "author_hierarchy": "You cannot mute a member with a role equal to or higher than yours.",
+    "bot_hierarchy": "I cannot mute {member} as their highest role is equal to or higher than mine.",
+    "role_unavailable": f"The '{MEDIA_MUTE_ROLE_NAME}' role could not be properly configured. "
+                        "Check bot permissions ('Manage Roles' server-wide and for channels) "
+                        "and console logs for details.",
+    "role_too_high_assign": f"My role is not high enough to assign or manage the '{MEDIA_MUTE_ROLE_NAME}' role.",
+    "role_too_high_remove": f"My role is not high enough to remove the '{MEDIA_MUTE_ROLE_NAME}' role.",
+    "already_muted": f"{{member}} already has the '{MEDIA_MUTE_ROLE_NAME}' role.",
+    "not_muted": f"{{member}} does not have the '{MEDIA_MUTE_ROLE_NAME}' role.",
+    "role_missing": f"The '{MEDIA_MUTE_ROLE_NAME}' role doesn't exist.",
+    "list_role_missing": f"The '{MEDIA_MUTE_ROLE_NAME}' role does not exist.",
+    "list_empty": f"No members currently have the '{MEDIA_MUTE_ROLE_NAME}' role.",
+    "bulk_no_members": "Specify at least one member to mute.",
+}
+
+def _pack_pages(lines, max_chars: int):
+    """Yields newline-terminated `lines` joined into pages of at most `max_chars` characters."""
+    page = io.StringIO()
+    length = 0
+    for line in lines:
+        if length and length + len(line) > max_chars:
+            yield page.getvalue()
+            page = io.StringIO()
+            length = 0
+        length += page.write(line)
+    if length:
+        yield page.getvalue()
 
 class Mute(commands.Cog):
     """
@@ -23,6 +87,165 @@ class Mute(commands.Cog):
     """
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # guild_id -> ids of members holding the 'Media Muted' role. Seeded lazily by
+        # `mutedlist` and kept current by the member/role listeners below.
+        self._muted_by_guild: dict[int, set[int]] = {}
+        # guild_id -> 'Media Muted' role id, so repeat lookups are a dict hit instead of a name scan.
+        # Persisted in `mute_role_settings` so restarts don't fall back to the scan either.
+        self._mute_role_cache: dict[int, int] = {}
+        # Guilds whose channel overwrites have been fully applied during this process.
+        self._overwrites_verified: set[int] = set()
+        # Caps concurrent set_permissions calls during an overwrite sweep (stays under the per-route bucket).
+        self._overwrite_sem = asyncio.Semaphore(5)
+        # (guild_id, author_id, title, color value) -> prebuilt error embed; copied per use, oldest evicted first.
+        self._err_templates: OrderedDict[tuple[int, int, str, int], discord.Embed] = OrderedDict()
+        self._cog_refs: dict[str, commands.Cog] = {} # See _get_cog
+        # Strong refs to in-flight background DB writes (History, role ids) so they aren't garbage-collected mid-run
+        self._pending_db_tasks: set[asyncio.Task] = set()
+
+        self.db_url = os.getenv("DATABASE_URL")
+        self.db_params = None
+        if self.db_url:
+            self.db_params = self._parse_db_url(self.db_url)
+        else:
+            log.warning("DATABASE_URL environment variable not set. Media Muted role ids will not be persisted.")
+
+    async def cog_load(self):
+        # Connect, DDL and the initial SELECT block on the DB; keep them off the event loop
+        if self.db_params:
+            await asyncio.to_thread(self._setup_db)
+
+    def _setup_db(self):
+        self._init_db()
+        self._load_mute_roles_from_db()
+
+    def _parse_db_url(self, url: str) -> Optional[dict]:
+        """ Parses the DATABASE_URL into connection parameters. """
+        try:
+            parsed = urlparse(url)
+            return {
+                "dbname": parsed.path[1:],
+                "user": parsed.username,
+                "password": parsed.password,
+                "host": parsed.hostname,
+                "port": parsed.port or 5432,
+                "sslmode": "require" if "sslmode=require" in url else None
+            }
+        except Exception as e:
+            log.error("Failed to parse DATABASE_URL: %s", e)
+            return None
+
+    def _get_db_connection(self):
+        """ Establishes and returns a database connection. Raises ConnectionError on failure. """
+        if not self.db_params:
+            raise ConnectionError("Database parameters are not configured.")
+        try:
+            return psycopg2.connect(**self.db_params)
+        except psycopg2.Error as e:
+            raise ConnectionError(f"Failed to connect to the database: {e}")
+
+    def _init_db(self):
+        """ Ensures the mute_role_settings table exists in the database. """
+        conn = None
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mute_role_settings (
+                    guild_id BIGINT PRIMARY KEY,
+                    role_id BIGINT NOT NULL
+                )
+            """)
+            conn.commit()
+            cursor.close()
+        except (psycopg2.Error, ConnectionError) as e:
+            log.error("Database table initialization failed: %s", e)
+        finally:
+            if conn:
+                conn.close()
+
+    def _load_mute_roles_from_db(self):
+        """Loads the stored Media Muted role ids into the in-memory cache."""
+        conn = None
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT guild_id, role_id FROM mute_role_settings")
+            self._mute_role_cache.update(cursor.fetchall())
+            cursor.close()
+        except (psycopg2.Error, ConnectionError) as e:
+            log.error("Failed to load Media Muted role ids: %s", e)
+        finally:
+            if conn:
+                conn.close()
+
+    def _store_mute_role_id(self, guild_id: int, role_id: int):
+        """Caches a guild's Media Muted role id; the database upsert runs in a worker thread in the background."""
+        self._mute_role_cache[guild_id] = role_id
+        if self.db_params:
+            self._run_in_background(self._save_mute_role_id, guild_id, role_id)
+
+    def _save_mute_role_id(self, guild_id: int, role_id: int):
+        """Upserts a guild's Media Muted role id (blocking; see _store_mute_role_id)."""
+        conn = None
+        try:
+            conn = self._get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO mute_role_settings (guild_id, role_id)
+                VALUES (%s, %s)
+                ON CONFLICT (guild_id) DO UPDATE SET role_id = EXCLUDED.role_id
+            """, (guild_id, role_id))
+            conn.commit()
+            cursor.close()
+        except (psycopg2.Error, ConnectionError) as e:
+            log.error("Failed to save Media Muted role id for guild %s: %s", guild_id, e)
+        finally:
+            if conn:
+                conn.close()
+
+    def _get_cog(self, name: str) -> Optional[commands.Cog]:
+        """
+        Memoized bot.get_cog for the helper cogs used on every command (Utils, History).
+        Misses are not cached, so a cog loaded after this one is still picked up. After a reload
+        of Utils/History the old instance keeps being used; neither keeps state beyond its DB settings.
+        """
+        cog = self._cog_refs.get(name)
+        if cog is None:
+            cog = self.bot.get_cog(name)
+            if cog is not None:
+                self._cog_refs[name] = cog
+        return cog
+
+    @staticmethod
+    def _has_role(member: discord.Member, role_id: int) -> bool:
+        """
+        Role membership via the member's private SnowflakeList (bisect, no Role list rebuild).
+        Swap for `any(r.id == role_id for r in member.roles)` if discord.py changes `_roles`.
+        """
+        return member._roles.has(role_id)
+
+    def _get_muted_ids(self, guild: discord.Guild, media_mute_role: discord.Role) -> set[int]:
+        """Returns the cached muted-member ids for a guild, seeding from the role on a miss (e.g. after a restart)."""
+        muted_ids = self._muted_by_guild.get(guild.id)
+        if muted_ids is None:
+            muted_ids = self._muted_by_guild[guild.id] = {m.id for m in media_mute_role.members}
+        return muted_ids
+
+    def _resolve_mute_role(self, guild: discord.Guild) -> discord.Role | None:
+        """Returns the 'Media Muted' role for a guild, using the cached role id when possible."""
+        role_id = self._mute_role_cache.get(guild.id)
+        if role_id is not None:
+            role = guild.get_role(role_id)
+            # A stored id may point at a role renamed while the bot was offline; only the name makes it 'the' role
+            if role and role.name == MEDIA_MUTE_ROLE_NAME:
+                return role
+            self._mute_role_cache.pop(guild.id, None)
+
+        role = discord.utils.get(guild.roles, name=MEDIA_MUTE_ROLE_NAME)
+        if role:
+            self._store_mute_role_id(guild.id, role.id)
+        return role
 
     async def _ensure_media_mute_role_setup(self, guild: discord.Guild) -> discord.Role | None:
         """
@@ -30,293 +253,543 @@ class Mute(commands.Cog):
         and applies necessary channel overwrites.
         Returns the 'Media Muted' role object, or None if setup fails.
         """
-        media_mute_role = discord.utils.get(guild.roles, name=MEDIA_MUTE_ROLE_NAME)
+        # Fast path: role known and fully verified since the last relevant role/channel change
+        if (role_id := self._mute_role_cache.get(guild.id)) and guild.id in self._overwrites_verified:
+            if media_mute_role := guild.get_role(role_id):
+                return media_mute_role
 
-        desired_server_permissions = guild.default_role.permissions
-        desired_server_permissions.update(**PERMISSIONS_TO_DENY)
+        media_mute_role = self._resolve_mute_role(guild)
+
+        desired_server_permissions_value = self._desired_role_permissions(guild)
+        # Only a guild whose role permissions are known to be right may be marked verified below
+        role_permissions_ok = True
 
         # role_created_now = False # Flag not strictly needed with current logic flow
 
         if media_mute_role:
-            if media_mute_role.permissions != desired_server_permissions:
-                print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Server permissions differ. Updating...")
+            if media_mute_role.permissions.value != desired_server_permissions_value:
+                log.info("'%s' in '%s': Server permissions differ. Updating...", MEDIA_MUTE_ROLE_NAME, guild.name)
                 try:
                     await media_mute_role.edit(
-                        permissions=desired_server_permissions,
+                        permissions=discord.Permissions(desired_server_permissions_value),
                         reason=f"Ensuring '{MEDIA_MUTE_ROLE_NAME}' has correct server-level permissions."
                     )
-                    print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Server permissions updated.")
+                    log.info("'%s' in '%s': Server permissions updated.", MEDIA_MUTE_ROLE_NAME, guild.name)
                 except discord.Forbidden:
-                    print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Bot lacks permission to edit role (server perms).")
+                    role_permissions_ok = False
+                    log.warning("'%s' in '%s': Bot lacks permission to edit role (server perms).", MEDIA_MUTE_ROLE_NAME, guild.name)
                 except discord.HTTPException as e:
-                    print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': HTTP error updating server permissions: {e}")
+                    role_permissions_ok = False
+                    log.warning("'%s' in '%s': HTTP error updating server permissions: %s", MEDIA_MUTE_ROLE_NAME, guild.name, e)
                 except Exception as e:
-                    print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Unexpected error updating server permissions: {e}")
-                    traceback.print_exc()
+                    role_permissions_ok = False
+                    log.exception("'%s' in '%s': Unexpected error updating server permissions: %s", MEDIA_MUTE_ROLE_NAME, guild.name, e)
         else:
-            print(f"'{MEDIA_MUTE_ROLE_NAME}' not found in '{guild.name}'. Attempting to create...")
+            log.info("'%s' not found in '%s'. Attempting to create...", MEDIA_MUTE_ROLE_NAME, guild.name)
             try:
                 media_mute_role = await guild.create_role(
                     name=MEDIA_MUTE_ROLE_NAME,
-                    permissions=desired_server_permissions,
+                    permissions=discord.Permissions(desired_server_permissions_value),
                     reason=f"Creating '{MEDIA_MUTE_ROLE_NAME}' for media/reaction restrictions."
                 )
-                print(f"'{MEDIA_MUTE_ROLE_NAME}' created in '{guild.name}'.")
+                log.info("'%s' created in '%s'.", MEDIA_MUTE_ROLE_NAME, guild.name)
+                self._store_mute_role_id(guild.id, media_mute_role.id)
                 # role_created_now = True
 
                 # --- CORRECTED SYSTEM CHANNEL CHECK ---
-                if guild.system_channel: # Check if system_channel exists first
-                    # Then check if bot can send messages there
-                    if guild.system_channel.permissions_for(guild.me).send_messages:
-                        try:
-                            await guild.system_channel.send(
-                                f"The '{MEDIA_MUTE_ROLE_NAME}' role has been automatically created/configured. "
-                                "Please review its position in the role hierarchy."
-                            )
-                        except discord.Forbidden:
-                            print(f"Could not send role creation notification to system channel in '{guild.name}' (Forbidden).")
-                        except discord.HTTPException as e:
-                            print(f"Could not send role creation notification to system channel in '{guild.name}' (HTTPException: {e}).")
+                if NOTIFY_SYSTEM_CHANNEL_ON_CREATE:
+                    system_channel = guild.system_channel # Property does a channel lookup; resolve it once
+                    if system_channel: # Check if system_channel exists first
+                        # Then check if bot can send messages there
+                        if system_channel.permissions_for(guild.me).send_messages:
+                            try:
+                                await system_channel.send(
+                                    f"The '{MEDIA_MUTE_ROLE_NAME}' role has been automatically created/configured. "
+                                    "Please review its position in the role hierarchy."
+                                )
+                            except discord.Forbidden:
+                                log.warning("Could not send role creation notification to system channel in '%s' (Forbidden).", guild.name)
+                            except discord.HTTPException as e:
+                                log.warning("Could not send role creation notification to system channel in '%s' (HTTPException: %s).", guild.name, e)
+                        else:
+                            log.debug("Bot lacks send_messages permission in system channel for '%s'.", guild.name)
                     else:
-                        print(f"Bot lacks send_messages permission in system channel for '{guild.name}'.")
-                else:
-                    print(f"No system channel configured in '{guild.name}' to send role creation notification.")
+                        log.debug("No system channel configured in '%s' to send role creation notification.", guild.name)
                 # --- END OF CORRECTION ---
 
             except discord.Forbidden:
-                print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Bot lacks 'Manage Roles' to create role.")
+                log.warning("'%s' in '%s': Bot lacks 'Manage Roles' to create role.", MEDIA_MUTE_ROLE_NAME, guild.name)
                 return None
             except discord.HTTPException as e:
-                print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': HTTP error creating role: {e}")
+                log.warning("'%s' in '%s': HTTP error creating role: %s", MEDIA_MUTE_ROLE_NAME, guild.name, e)
                 return None
             except Exception as e:
-                print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Unexpected error creating role: {e}")
-                traceback.print_exc()
+                log.exception("'%s' in '%s': Unexpected error creating role: %s", MEDIA_MUTE_ROLE_NAME, guild.name, e)
                 return None
 
         if not media_mute_role: # If role still None after trying to find or create
             return None
 
-        # Apply/Verify channel-specific overwrites
-        overwrite_for_channels = discord.PermissionOverwrite(**PERMISSIONS_TO_DENY)
+        if guild.id not in self._overwrites_verified:
+            if await self._apply_channel_overwrites(guild, media_mute_role) and role_permissions_ok:
+                self._overwrites_verified.add(guild.id)
+        return media_mute_role
+
+    @staticmethod
+    def _desired_role_permissions(guild: discord.Guild) -> int:
+        """
+        @everyone's permissions minus the denied ones, so the role never grants anything extra;
+        the actual restriction comes from the channel overwrites. Returned as a plain int; the
+        Permissions object is only built when the role has to be written.
+        """
+        return guild.default_role.permissions.value & ~_DENY_MASK
+
+    async def _apply_channel_overwrites(self, guild: discord.Guild, media_mute_role: discord.Role) -> bool:
+        """
+        Applies/verifies the 'Media Muted' overwrites on every category and text channel.
+        Categories are included so channels created in them later inherit the overwrite;
+        existing children still get their own overwrite since the API does not propagate it.
+        Channels are processed concurrently, bounded by `self._overwrite_sem`.
+        Returns True when no channel failed.
+        """
+        log.debug("'%s' in '%s': Applying/verifying channel overwrites...", MEDIA_MUTE_ROLE_NAME, guild.name)
+        # Single pass over the raw channel map; guild.categories/text_channels each build and sort a list
+        channels = [c for c in guild._channels.values() if isinstance(c, (discord.TextChannel, discord.CategoryChannel))]
+        # Administrator overrides every channel overwrite, so the per-channel permission fold can be skipped
+        is_admin = guild.me.guild_permissions.administrator
+        tasks = [self._set_one(channel, media_mute_role, is_admin) for channel in channels]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        processed_channels = results.count("processed")
+        skipped_channels = results.count("skipped")
+        failed_channels = len(results) - processed_channels - skipped_channels
+        if skipped_channels and log.isEnabledFor(logging.DEBUG):
+            skipped_names = ", ".join(f"#{c.name}" for c, r in zip(channels, results) if r == "skipped")
+            log.debug("'%s' in '%s': Skipped (bot lacks Manage Roles there): %s", MEDIA_MUTE_ROLE_NAME, guild.name, skipped_names)
         
-        print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Applying/verifying channel overwrites...")
-        processed_channels = 0
-        skipped_channels = 0
-        failed_channels = 0
+        log.info("'%s' in '%s': Channel overwrite process completed. Processed: %s, Skipped: %s, Failed: %s.", MEDIA_MUTE_ROLE_NAME, guild.name, processed_channels, skipped_channels, failed_channels)
+        return not failed_channels
 
-        for channel in guild.text_channels:
+    async def _set_one(self, channel: discord.abc.GuildChannel, media_mute_role: discord.Role, is_admin: bool = False) -> str:
+        """Applies the overwrite to a single channel. Returns 'processed', 'skipped' or 'failed'."""
+        async with self._overwrite_sem:
             try:
-                if channel.permissions_for(guild.me).manage_roles:
-                    current_channel_overwrite = channel.overwrites_for(media_mute_role)
-                    needs_update = any(getattr(current_channel_overwrite, perm_name) != perm_value for perm_name, perm_value in PERMISSIONS_TO_DENY.items())
-                    
-                    if needs_update:
-                        await channel.set_permissions(
-                            media_mute_role,
-                            overwrite=overwrite_for_channels,
-                            reason=f"Enforcing '{MEDIA_MUTE_ROLE_NAME}' restrictions in channel."
-                        )
-                    processed_channels += 1 # Count as processed if no update needed or update succeeded
-                else:
-                    print(f"Skipping channel #{channel.name} for '{MEDIA_MUTE_ROLE_NAME}' overwrites: Bot lacks Manage Roles permission there.")
-                    skipped_channels +=1
+                if not is_admin and not channel.permissions_for(channel.guild.me).manage_roles:
+                    return "skipped" # Reported once in the sweep summary
+
+                # Compare the (allow, deny) bitmask pair rather than each permission attribute
+                if channel.overwrites_for(media_mute_role).pair() != _DESIRED_OVERWRITE_PAIR:
+                    # 429s are retried by discord.py's HTTP client; one that gets through here is a ban or exhausted retries
+                    await channel.set_permissions(
+                        media_mute_role,
+                        overwrite=_DESIRED_OVERWRITE,
+                        reason=f"Enforcing '{MEDIA_MUTE_ROLE_NAME}' restrictions in channel."
+                    )
+                return "processed" # Counted as processed if no update needed or update succeeded
             except discord.Forbidden:
-                print(f"Forbidden to set overwrites for '{MEDIA_MUTE_ROLE_NAME}' in channel #{channel.name}.")
-                failed_channels +=1
+                log.warning("Forbidden to set overwrites for '%s' in channel #%s.", MEDIA_MUTE_ROLE_NAME, channel.name)
             except discord.HTTPException as e:
-                print(f"HTTP error setting overwrites for '{MEDIA_MUTE_ROLE_NAME}' in #{channel.name}: {e}")
-                failed_channels +=1
+                log.warning("HTTP error setting overwrites for '%s' in #%s: %s", MEDIA_MUTE_ROLE_NAME, channel.name, e)
             except Exception as e:
-                print(f"Unexpected error with channel overwrites for '{MEDIA_MUTE_ROLE_NAME}' in #{channel.name}: {e}")
-                traceback.print_exc()
-                failed_channels +=1
-        
-        print(f"'{MEDIA_MUTE_ROLE_NAME}' in '{guild.name}': Channel overwrite process completed. Processed: {processed_channels}, Skipped: {skipped_channels}, Failed: {failed_channels}.")
-        return media_mute_role
+                log.exception("Unexpected error with channel overwrites for '%s' in #%s: %s", MEDIA_MUTE_ROLE_NAME, channel.name, e)
+            return "failed"
+
+    def _log_history(self, ctx: commands.Context, member: discord.Member, action: str, reason: str):
+        """
+        Records the action with the History cog without holding up the command: its log_action
+        is a blocking psycopg2 write, so it runs in a worker thread as a background task.
+        """
+        history_cog = self._get_cog('History')
+        if not history_cog:
+            return
+        self._run_in_background(history_cog.log_action, ctx.guild.id, member.id, action, ctx.author, reason)
+
+    def _run_in_background(self, func, *args):
+        """Runs a blocking call in a worker thread as a tracked background task."""
+        task = asyncio.create_task(asyncio.to_thread(func, *args))
+        self._pending_db_tasks.add(task)
+        task.add_done_callback(self._pending_db_tasks.discard)
+
+    async def _edit_mute_role(self, member: discord.Member, media_mute_role: discord.Role, add: bool, reason: str):
+        """
+        Adds or removes just the Media Muted role. The single-role endpoints leave the member's
+        other roles alone, so concurrent role changes by other moderators or bots are kept.
+        """
+        if add:
+            await member.add_roles(media_mute_role, reason=reason)
+        else:
+            await member.remove_roles(media_mute_role, reason=reason)
 
     @commands.command(name="mute") # Consider renaming to "mediamute" if desired
     @commands.has_permissions(moderate_members=True)
+    @commands.cooldown(1, 2, commands.BucketType.member)
     @commands.bot_has_permissions(manage_roles=True) 
     async def mute_command(self, ctx: commands.Context, member: discord.Member, *, reason: str = "Not specified"):
         """
         Mutes a member by restricting media/reactions using the 'Media Muted' role.
         Usage: .mute <@member/ID> [reason]
         """
-        utils_cog = self.bot.get_cog('Utils') 
+        utils_cog = self._get_cog('Utils')
         if not utils_cog:
-            await ctx.send("Error: Utils cog is not loaded, cannot create embeds.")
+            await ctx.send("Error: Utils cog is not loaded, cannot create embeds.", allowed_mentions=_SAFE_MENTIONS)
             return
+        is_owner = ctx.guild.owner_id == ctx.author.id
 
-        media_mute_role = await self._ensure_media_mute_role_setup(ctx.guild)
-        if not media_mute_role:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Mute Failed",
-                                                       description=f"The '{MEDIA_MUTE_ROLE_NAME}' role could not be properly configured. "
-                                                                   "Check bot permissions ('Manage Roles' server-wide and for channels) "
-                                                                   "and console logs for details.",
-                                                       color=discord.Color.red()))
-            return
+        # Snapshot role positions once; top_role re-derives the highest role on every access
+        author_pos = ctx.author.top_role.position
+        bot_pos = ctx.guild.me.top_role.position
+        member_pos = member.top_role.position
 
-        # Standard Checks
+        # Standard Checks (local only, so rejected requests never touch the role setup or the API)
         if member.id == ctx.guild.owner_id:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Error", description="The server owner cannot be muted.", color=discord.Color.red()))
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Error", MESSAGES["owner"]), allowed_mentions=_SAFE_MENTIONS)
             return
-        if member.id == ctx.author.id and ctx.guild.owner_id != ctx.author.id:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Error", description="You cannot mute yourself.", color=discord.Color.red()))
+        if member.id == ctx.author.id and not is_owner:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Error", MESSAGES["self"]), allowed_mentions=_SAFE_MENTIONS)
             return
         if member.bot:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Error", description="Bots cannot be muted with this command.", color=discord.Color.red()))
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Error", MESSAGES["bot"]), allowed_mentions=_SAFE_MENTIONS)
+            return
+        if member_pos >= author_pos and not is_owner:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Hierarchy Error", MESSAGES["author_hierarchy"]), allowed_mentions=_SAFE_MENTIONS)
             return
-        if member.top_role >= ctx.author.top_role and ctx.guild.owner_id != ctx.author.id:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Hierarchy Error", description="You cannot mute a member with a role equal to or higher than yours.", color=discord.Color.red()))
+        if member_pos >= bot_pos:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Hierarchy Error", MESSAGES["bot_hierarchy"].format(member=member.mention)), allowed_mentions=_SAFE_MENTIONS)
             return
-        if media_mute_role >= ctx.guild.me.top_role:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Hierarchy Error", description=f"My role is not high enough to assign or manage the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.red()))
+
+        media_mute_role = await self._ensure_media_mute_role_setup(ctx.guild)
+        if not media_mute_role:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Mute Failed", MESSAGES["role_unavailable"]), allowed_mentions=_SAFE_MENTIONS)
             return
-        if member.top_role >= ctx.guild.me.top_role:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Hierarchy Error", description=f"I cannot mute {member.mention} as their highest role is equal to or higher than mine.", color=discord.Color.red()))
+        if media_mute_role.position >= bot_pos:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Hierarchy Error", MESSAGES["role_too_high_assign"]), allowed_mentions=_SAFE_MENTIONS)
             return
 
-        if media_mute_role in member.roles:
-            print(f"User {member.display_name} already has '{MEDIA_MUTE_ROLE_NAME}'. Re-verifying role/channel setup.")
-            await self._ensure_media_mute_role_setup(ctx.guild) 
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Already Media Muted", description=f"{member.mention} already has the '{MEDIA_MUTE_ROLE_NAME}' role. Permissions re-verified.", color=discord.Color.orange()))
+        if self._has_role(member, media_mute_role.id):
+            # Role/channel setup was already verified above; no second sweep for a no-op mute.
+            self._get_muted_ids(ctx.guild, media_mute_role).add(member.id)
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Already Media Muted", MESSAGES["already_muted"].format(member=member.mention), discord.Color.orange()), allowed_mentions=_SAFE_MENTIONS)
             return
 
         try:
-            await member.add_roles(media_mute_role, reason=f"Media Muted by {ctx.author.display_name} for: {reason}")
+            await self._edit_mute_role(member, media_mute_role, True, reason=f"Media Muted by {ctx.author.display_name} for: {reason}"[:AUDIT_REASON_MAX])
+            self._get_muted_ids(ctx.guild, media_mute_role).add(member.id)
             
             embed = utils_cog.create_embed(ctx, title="Member Media Muted",
                                            description=f"{member.mention} has been '{MEDIA_MUTE_ROLE_NAME}', restricting media and reactions.",
                                            color=discord.Color.green())
             embed.add_field(name="Reason", value=reason, inline=False)
-            await ctx.send(embed=embed)
+            await ctx.send(embed=embed, allowed_mentions=_SAFE_MENTIONS)
 
-            history_cog = self.bot.get_cog('History')
-            if history_cog:
-                history_cog.log_action(ctx.guild.id, member.id, f"Media Muted (Role: {MEDIA_MUTE_ROLE_NAME})", ctx.author, reason)
+            self._log_history(ctx, member, f"Media Muted (Role: {MEDIA_MUTE_ROLE_NAME})", reason)
 
         except discord.Forbidden:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Permissions Error", description=f"Failed to assign the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.red()))
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="Permissions Error", description=f"Failed to assign the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.red()), allowed_mentions=_SAFE_MENTIONS)
         except discord.HTTPException as e:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="API Error", description=f"An error occurred while applying media mute: {e}", color=discord.Color.red()))
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="API Error", description=f"An error occurred while applying media mute: {e}", color=discord.Color.red()), allowed_mentions=_SAFE_MENTIONS)
         except Exception as e:
-            traceback.print_exc()
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Unexpected Mute Error", description=f"An unexpected error occurred: {e}", color=discord.Color.red()))
+            log.exception("Mute failure in %s", ctx.command)
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="Unexpected Mute Error", description=f"An unexpected error occurred: {e}", color=discord.Color.red()), allowed_mentions=_SAFE_MENTIONS)
+
+    @commands.command(name="mutemany")
+    @commands.has_permissions(moderate_members=True)
+    @commands.cooldown(1, 10, commands.BucketType.guild)
+    @commands.bot_has_permissions(manage_roles=True)
+    async def mute_many_command(self, ctx: commands.Context, members: commands.Greedy[discord.Member], *, reason: str = "Not specified"):
+        """
+        Media mutes several members at once, with at most BULK_MUTE_CONCURRENCY role edits in flight.
+        Usage: .mutemany <@member/ID> [@member/ID ...] [reason]
+        """
+        utils_cog = self._get_cog('Utils')
+        if not utils_cog:
+            await ctx.send("Error: Utils cog is not loaded, cannot create embeds.", allowed_mentions=_SAFE_MENTIONS)
+            return
+        if not members:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Error", MESSAGES["bulk_no_members"]), allowed_mentions=_SAFE_MENTIONS)
+            return
+
+        media_mute_role = await self._ensure_media_mute_role_setup(ctx.guild)
+        if not media_mute_role:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Mute Failed", MESSAGES["role_unavailable"]), allowed_mentions=_SAFE_MENTIONS)
+            return
+        bot_pos = ctx.guild.me.top_role.position
+        if media_mute_role.position >= bot_pos:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Hierarchy Error", MESSAGES["role_too_high_assign"]), allowed_mentions=_SAFE_MENTIONS)
+            return
+
+        # Same checks as `mute`, run once up front; Greedy may also yield duplicates
+        is_owner = ctx.guild.owner_id == ctx.author.id
+        author_pos = ctx.author.top_role.position
+        targets, skipped, seen = [], [], set()
+        for member in members:
+            if member.id in seen:
+                continue
+            seen.add(member.id)
+            member_pos = member.top_role.position
+            if (member.id == ctx.guild.owner_id or member.id == ctx.author.id or member.bot
+                    or (member_pos >= author_pos and not is_owner) or member_pos >= bot_pos
+                    or self._has_role(member, media_mute_role.id)):
+                skipped.append(member)
+            else:
+                targets.append(member)
+
+        audit_reason = f"Media Muted by {ctx.author.display_name} for: {reason}"[:AUDIT_REASON_MAX]
+        sem = asyncio.Semaphore(BULK_MUTE_CONCURRENCY)
+
+        async def _mute_one(member: discord.Member):
+            async with sem:
+                await self._edit_mute_role(member, media_mute_role, True, reason=audit_reason)
+
+        results = await asyncio.gather(*(_mute_one(m) for m in targets), return_exceptions=True)
+        muted_ids = self._get_muted_ids(ctx.guild, media_mute_role)
+        muted, failed = [], []
+        for member, result in zip(targets, results):
+            if isinstance(result, Exception):
+                log.warning("mutemany: failed to mute %s: %s", member.id, result)
+                failed.append(member)
+            else:
+                muted_ids.add(member.id)
+                muted.append(member)
+                self._log_history(ctx, member, f"Media Muted (Role: {MEDIA_MUTE_ROLE_NAME})", reason)
+
+        color = discord.Color.green() if muted and not failed else discord.Color.orange()
+        embed = utils_cog.create_embed(ctx, title="Bulk Media Mute",
+                                       description=f"Muted {len(muted)}, skipped {len(skipped)}, failed {len(failed)}.",
+                                       color=color)
+        for label, group in (("Muted", muted), ("Skipped", skipped), ("Failed", failed)):
+            if group:
+                embed.add_field(name=label, value=self._mention_list(group), inline=False)
+        embed.add_field(name="Reason", value=reason, inline=False)
+        await ctx.send(embed=embed, allowed_mentions=_SAFE_MENTIONS)
+
+    @staticmethod
+    def _mention_list(members: list[discord.Member], limit: int = 1024) -> str:
+        """Space-separated mentions that fit an embed field, never cutting one in half; the rest become '…and N more'."""
+        shown, length = [], 0
+        for i, member in enumerate(members):
+            remaining = len(members) - i
+            suffix = f" …and {remaining - 1} more" if remaining > 1 else ""
+            mention = member.mention
+            # Reserve room for the tail that would follow if this is the last mention shown
+            if length + len(mention) + 1 + len(suffix) > limit:
+                return f"{' '.join(shown)} …and {remaining} more".lstrip()
+            shown.append(mention)
+            length += len(mention) + 1
+        return " ".join(shown)
 
     @commands.command(name="unmute") # Consider renaming to "unmediamute"
     @commands.has_permissions(moderate_members=True)
+    @commands.cooldown(1, 2, commands.BucketType.member)
     @commands.bot_has_permissions(manage_roles=True)
     async def un_mute_command(self, ctx: commands.Context, member: discord.Member, *, reason: str = "Not specified"):
         """
         Unmutes a member by removing the 'Media Muted' role.
         Usage: .unmute <@member/ID> [reason]
         """
-        utils_cog = self.bot.get_cog('Utils')
+        utils_cog = self._get_cog('Utils')
         if not utils_cog:
-            await ctx.send("Error: Utils cog is not loaded.")
+            await ctx.send("Error: Utils cog is not loaded.", allowed_mentions=_SAFE_MENTIONS)
             return
 
-        media_mute_role = discord.utils.get(ctx.guild.roles, name=MEDIA_MUTE_ROLE_NAME)
+        media_mute_role = self._resolve_mute_role(ctx.guild)
         if not media_mute_role:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Unmute Failed", description=f"The '{MEDIA_MUTE_ROLE_NAME}' role doesn't exist.", color=discord.Color.red()))
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Unmute Failed", MESSAGES["role_missing"]), allowed_mentions=_SAFE_MENTIONS)
             return
         
-        if media_mute_role not in member.roles:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Not Media Muted", description=f"{member.mention} does not have the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.orange()))
+        if not self._has_role(member, media_mute_role.id):
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Not Media Muted", MESSAGES["not_muted"].format(member=member.mention), discord.Color.orange()), allowed_mentions=_SAFE_MENTIONS)
             return
 
-        if media_mute_role >= ctx.guild.me.top_role:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Hierarchy Error", description=f"My role is not high enough to remove the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.red()))
+        if media_mute_role.position >= ctx.guild.me.top_role.position:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, "Hierarchy Error", MESSAGES["role_too_high_remove"]), allowed_mentions=_SAFE_MENTIONS)
             return
             
         try:
-            await member.remove_roles(media_mute_role, reason=f"Media Unmuted by {ctx.author.display_name} for: {reason}")
+            await self._edit_mute_role(member, media_mute_role, False, reason=f"Media Unmuted by {ctx.author.display_name} for: {reason}"[:AUDIT_REASON_MAX])
+            self._get_muted_ids(ctx.guild, media_mute_role).discard(member.id)
             embed = utils_cog.create_embed(ctx, title="Member Media Unmuted",
                                            description=f"{member.mention}'s media/reaction restrictions have been lifted.",
                                            color=discord.Color.green())
             embed.add_field(name="Reason", value=reason, inline=False)
-            await ctx.send(embed=embed)
+            await ctx.send(embed=embed, allowed_mentions=_SAFE_MENTIONS)
 
-            history_cog = self.bot.get_cog('History')
-            if history_cog:
-                history_cog.log_action(ctx.guild.id, member.id, f"Media Unmuted (Role: {MEDIA_MUTE_ROLE_NAME})", ctx.author, reason)
+            self._log_history(ctx, member, f"Media Unmuted (Role: {MEDIA_MUTE_ROLE_NAME})", reason)
 
         except discord.Forbidden:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Permissions Error", description=f"Failed to remove the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.red()))
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="Permissions Error", description=f"Failed to remove the '{MEDIA_MUTE_ROLE_NAME}' role.", color=discord.Color.red()), allowed_mentions=_SAFE_MENTIONS)
         except discord.HTTPException as e:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="API Error", description=f"An error occurred while unmuting: {e}", color=discord.Color.red()))
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="API Error", description=f"An error occurred while unmuting: {e}", color=discord.Color.red()), allowed_mentions=_SAFE_MENTIONS)
         except Exception as e:
-            traceback.print_exc()
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Unexpected Unmute Error", description=f"An unexpected error occurred: {e}", color=discord.Color.red()))
+            log.exception("Unmute failure in %s", ctx.command)
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="Unexpected Unmute Error", description=f"An unexpected error occurred: {e}", color=discord.Color.red()), allowed_mentions=_SAFE_MENTIONS)
 
     @commands.command(name="mutedlist") # Or "mediamutedlist"
     @commands.has_permissions(manage_messages=True)
+    @commands.cooldown(1, 10, commands.BucketType.guild)
     async def muted_list_command(self, ctx: commands.Context):
         """Displays a list of members who currently have the 'Media Muted' role."""
-        utils_cog = self.bot.get_cog('Utils')
-        if not utils_cog: await ctx.send("Error: Utils cog not loaded."); return
+        utils_cog = self._get_cog('Utils')
+        if not utils_cog: await ctx.send("Error: Utils cog not loaded.", allowed_mentions=_SAFE_MENTIONS); return
 
-        media_mute_role = discord.utils.get(ctx.guild.roles, name=MEDIA_MUTE_ROLE_NAME)
+        media_mute_role = self._resolve_mute_role(ctx.guild)
         if not media_mute_role:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Media Muted List", description=f"The '{MEDIA_MUTE_ROLE_NAME}' role does not exist."))
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="Media Muted List", description=MESSAGES["list_role_missing"]), allowed_mentions=_SAFE_MENTIONS)
             return
 
-        muted_members = [m for m in ctx.guild.members if media_mute_role in m.roles]
+        muted_ids = self._get_muted_ids(ctx.guild, media_mute_role)
+        # muted_ids is a set; sort so pages keep a stable order across calls and restarts
+        muted_members = sorted((m for m in map(ctx.guild.get_member, muted_ids) if m), key=lambda m: (m.display_name.casefold(), m.id))
 
         if not muted_members:
-            await ctx.send(embed=utils_cog.create_embed(ctx, title="Media Muted List", description=f"No members currently have the '{MEDIA_MUTE_ROLE_NAME}' role."))
+            await ctx.send(embed=utils_cog.create_embed(ctx, title="Media Muted List", description=MESSAGES["list_empty"]), allowed_mentions=_SAFE_MENTIONS)
+            return
+
+        # Pack lines into as few embeds as fit under Discord's 4096-char description limit
+        pages = list(_pack_pages((f"- <@{m.id}> ({m.id})\n" for m in muted_members), MUTED_LIST_PAGE_CHARS))
+        for page_num, description in enumerate(pages, start=1):
+            title = f"Members with '{MEDIA_MUTE_ROLE_NAME}' Role ({len(muted_members)})"
+            if len(pages) > 1:
+                title += f" - Page {page_num}/{len(pages)}"
+            await ctx.send(embed=utils_cog.create_embed(ctx, title=title, description=description), allowed_mentions=_SAFE_MENTIONS)
+
+    # --- Listeners ---
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Keeps the cached muted-member ids in sync when roles change."""
+        # Most updates come from guilds whose muted set was never seeded; one dict probe rejects them.
+        muted_ids = self._muted_by_guild.get(after.guild.id)
+        if muted_ids is None:
+            return
+        role_id = self._mute_role_cache.get(after.guild.id)
+        if role_id is None or before._roles == after._roles:
+            return
+        if self._has_role(after, role_id):
+            muted_ids.add(after.id)
+        else:
+            muted_ids.discard(after.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        muted_ids = self._muted_by_guild.get(member.guild.id)
+        if muted_ids is not None:
+            muted_ids.discard(member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        if role.name == MEDIA_MUTE_ROLE_NAME or self._mute_role_cache.get(role.guild.id) == role.id:
+            self._forget_guild(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        guild = after.guild
+        role_id = self._mute_role_cache.get(guild.id)
+        if role_id is None:
+            return
+        # The role's server permissions mirror @everyone's; re-sync them on the next mute if they no
+        # longer match. Only a mismatch counts, so the bot's own role.edit doesn't undo its verification.
+        if after.is_default():
+            role = guild.get_role(role_id)
+            if role and before.permissions != after.permissions and role.permissions.value != self._desired_role_permissions(guild):
+                self._overwrites_verified.discard(guild.id)
+            return
+        if role_id != after.id:
             return
+        # A renamed role is no longer 'the' Media Muted role; resolve it again by name next time.
+        if after.name != MEDIA_MUTE_ROLE_NAME:
+            self._forget_guild(guild.id)
+        elif after.permissions.value != self._desired_role_permissions(guild):
+            self._overwrites_verified.discard(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        # New channels need the overwrite too; re-run the sweep on the next mute.
+        self._overwrites_verified.discard(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        # A moderator may have loosened or removed the Media Muted overwrite; repair it on the next mute.
+        # Only a change away from the desired overwrite counts (not the sweep's own set_permissions),
+        # and only on the channel types the sweep covers.
+        role_id = self._mute_role_cache.get(after.guild.id)
+        if role_id is None or after.guild.id not in self._overwrites_verified:
+            return
+        if not isinstance(after, (discord.TextChannel, discord.CategoryChannel)):
+            return
+        role = after.guild.get_role(role_id)
+        if role is None:
+            self._overwrites_verified.discard(after.guild.id)
+            return
+        overwrite = after.overwrites_for(role)
+        if overwrite != before.overwrites_for(role) and overwrite.pair() != _DESIRED_OVERWRITE_PAIR:
+            self._overwrites_verified.discard(after.guild.id)
 
-        description = "\n".join([f"- {member.mention} ({member.id})" for member in muted_members])
-        embed = utils_cog.create_embed(ctx, title=f"Members with '{MEDIA_MUTE_ROLE_NAME}' Role ({len(muted_members)})", description=description)
-        await ctx.send(embed=embed)
+    def _forget_guild(self, guild_id: int):
+        """Drops every cached entry for a guild."""
+        self._mute_role_cache.pop(guild_id, None)
+        self._overwrites_verified.discard(guild_id)
+        self._muted_by_guild.pop(guild_id, None)
 
     # --- Error Handlers ---
+    def _error_embed(self, ctx: commands.Context, utils_cog, title: str, description: Optional[str] = None,
+                     color: discord.Color = discord.Color.red()) -> discord.Embed:
+        """Returns a fresh copy of a cached error/notice embed (red by default), building it via Utils on first use."""
+        key = (ctx.guild.id if ctx.guild else 0, ctx.author.id, title, color.value)
+        template = self._err_templates.get(key)
+        if template is None:
+            template = self._err_templates[key] = utils_cog.create_embed(ctx, title=title, color=color)
+            if len(self._err_templates) > ERROR_TEMPLATE_CACHE_SIZE:
+                self._err_templates.popitem(last=False)
+        else:
+            self._err_templates.move_to_end(key)
+        embed = template.copy()
+        embed.timestamp = discord.utils.utcnow()
+        embed.description = description
+        return embed
+
+    def _format_error(self, error: commands.CommandError, action: str, command_name: str) -> str:
+        """Maps a mute/unmute command error to its user-facing description. `action` is e.g. 'media mute'."""
+        for error_type, describe in _ERROR_DESCRIPTIONS:
+            if isinstance(error, error_type):
+                return describe(error)
+        if isinstance(error, commands.CommandInvokeError):
+            log.error("Error in %s: %s", command_name, error.original, exc_info=error.original)
+            if isinstance(error.original, discord.Forbidden):
+                return f"Permissions error during {action}. Check my 'Manage Roles' permission and role hierarchy."
+            if isinstance(error.original, discord.HTTPException):
+                return f"Network error during {action}: {error.original}"
+            return f"Internal error during {action}. Check console."
+        return f"An unexpected error occurred: {error}"
+
+    async def _handle_command_error(self, ctx, error, title: str, action: str):
+        desc = self._format_error(error, action, ctx.command.qualified_name if ctx.command else action)
+        utils_cog = self._get_cog('Utils')
+        if utils_cog:
+            await ctx.send(embed=self._error_embed(ctx, utils_cog, title, desc), allowed_mentions=_SAFE_MENTIONS)
+        else:
+            await ctx.send(f"{title}: {desc}", allowed_mentions=_SAFE_MENTIONS)
+
     @mute_command.error
     async def mute_command_error(self, ctx, error):
-        utils_cog = self.bot.get_cog('Utils')
-        embed = utils_cog.create_embed(ctx, title="Media Mute Command Error", color=discord.Color.red()) if utils_cog else None
-        
-        desc = f"An unexpected error occurred: {error}" # Default
-        if isinstance(error, commands.MissingPermissions): desc = "You need 'Moderate Members' permission."
-        elif isinstance(error, commands.BotMissingPermissions): desc = f"I'm missing 'Manage Roles' permission. (Missing: {', '.join(error.missing_permissions)})"
-        elif isinstance(error, commands.MemberNotFound): desc = f"Member '{error.argument}' not found."
-        elif isinstance(error, commands.MissingRequiredArgument): desc = f"Missing argument: {error.param.name}."
-        elif isinstance(error, commands.CommandInvokeError):
-            print(f"Error in mute_command: {error.original}"); traceback.print_exc()
-            if isinstance(error.original, discord.Forbidden):
-                desc = "Permissions error during media mute. Check my 'Manage Roles' permission and role hierarchy."
-            elif isinstance(error.original, discord.HTTPException):
-                 desc = f"Network error during media mute: {error.original}"
-            else:
-                desc = "Internal error during media mute. Check console."
-        
-        if embed: embed.description = desc; await ctx.send(embed=embed)
-        else: await ctx.send(f"Media Mute Command Error: {desc}")
+        await self._handle_command_error(ctx, error, "Media Mute Command Error", "media mute")
+
+    @mute_many_command.error
+    async def mute_many_command_error(self, ctx, error):
+        await self._handle_command_error(ctx, error, "Bulk Media Mute Command Error", "bulk media mute")
 
     @un_mute_command.error
     async def un_mute_command_error(self, ctx, error):
-        utils_cog = self.bot.get_cog('Utils')
-        embed = utils_cog.create_embed(ctx, title="Media Unmute Command Error", color=discord.Color.red()) if utils_cog else None
-
-        desc = f"An unexpected error occurred: {error}" # Default
-        if isinstance(error, commands.MissingPermissions): desc = "You need 'Moderate Members' permission."
-        elif isinstance(error, commands.BotMissingPermissions): desc = f"I'm missing 'Manage Roles' permission. (Missing: {', '.join(error.missing_permissions)})"
-        elif isinstance(error, commands.MemberNotFound): desc = f"Member '{error.argument}' not found."
-        elif isinstance(error, commands.MissingRequiredArgument): desc = f"Missing argument: {error.param.name}."
-        elif isinstance(error, commands.CommandInvokeError):
-            print(f"Error in un_mute_command: {error.original}"); traceback.print_exc()
-            if isinstance(error.original, discord.Forbidden):
-                desc = "Permissions error during media unmute. Check my 'Manage Roles' permission and role hierarchy."
-            elif isinstance(error.original, discord.HTTPException):
-                desc = f"Network error during media unmute: {error.original}"
-            else:
-                desc = "Internal error during media unmute. Check console."
-            
-        if embed: embed.description = desc; await ctx.send(embed=embed)
-        else: await ctx.send(f"Media Unmute Command Error: {desc}")
+        await self._handle_command_error(ctx, error, "Media Unmute Command Error", "media unmute")
+
+    @muted_list_command.error
+    async def muted_list_command_error(self, ctx, error):
+        if isinstance(error, commands.CommandOnCooldown):
+            await ctx.send(f"Command on cooldown. Try again in {error.retry_after:.2f}s.", allowed_mentions=_SAFE_MENTIONS)
+        elif isinstance(error, commands.MissingPermissions):
+            await ctx.send("You need 'Manage Messages' permission to use this command.", allowed_mentions=_SAFE_MENTIONS)
+        else:
+            log.error("Error in muted_list_command: %s", error, exc_info=getattr(error, 'original', error))
+            await ctx.send(f"An unexpected error occurred: {error}", allowed_mentions=_SAFE_MENTIONS)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Mute(bot))
-    print(f"Cog 'Mute (using {MEDIA_MUTE_ROLE_NAME} role, corrected system channel logic)' loaded.")
+    log.info("Cog 'Mute (using %s role, corrected system channel logic)' loaded.", MEDIA_MUTE_ROLE_NAME)
@@ -1,13 +1,19 @@
+import time
 from discord.ext import commands
 
+_PING_FORMAT = "Pong! WS: {:.0f}ms | REST: {:.0f}ms"
+
 class Ping(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     @commands.command()
     async def ping(self, ctx):
-        latency = round(self.bot.latency * 1000)
-        await ctx.send(f'Pong! Latency: {latency}ms')
+        # REST round-trip is timed on the reply itself, then filled in with one edit
+        start = time.perf_counter()
+        message = await ctx.send("Pong!")
+        rest_ms = (time.perf_counter() - start) * 1000
+        await message.edit(content=_PING_FORMAT.format(self.bot.latency * 1000, rest_ms))
 
 async def setup(bot):
     await bot.add_cog(Ping(bot))
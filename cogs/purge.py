@@ -2,10 +2,51 @@ import discord
 from discord.ext import commands
 from discord import app_commands # Kept from original
 import typing # Required for typing.Union and typing.Optional
+import logging
+
+log = logging.getLogger(__name__)
+
+# channel.purge() already deletes in bulk-delete batches of 100 (one request per batch) and
+# falls back to single deletes for messages older than 14 days, so larger purges stay cheap.
+PURGE_MAX = 1000
+# Replies never ping: mentions in purge responses are for display only
+_SAFE_MENTIONS = discord.AllowedMentions.none()
+
+# Usage hints shown by purge/purge_error; `{prefix}` is filled once per prefix and cached on the cog
+_USAGE_TEMPLATES = {
+    "missing_target": "You're missing some arguments. Please specify a user and amount, or just an amount.\n"
+                      "Usage 1: `{prefix}purge @user <amount>`\n"
+                      "Usage 2: `{prefix}purge <amount>`",
+    "bad_target": "Invalid first argument. It must be a @user (or user ID) or an amount (a number).\n"
+                  "Example 1: `{prefix}purge @SomeUser 50`\n"
+                  "Example 2: `{prefix}purge 25`",
+    "bad_amount": f"The amount provided for the user must be a number (1-{PURGE_MAX}).\n"
+                  f"Example: `{{prefix}}purge @SomeUser 50`",
+    "invalid_syntax": "Invalid syntax. To purge messages from anyone, use `{prefix}purge <amount>` (e.g., `{prefix}purge 50`).\n"
+                      "To purge from a user, use `{prefix}purge @user <amount>`.",
+}
+
+class PurgeTarget(commands.Converter):
+    """
+    Resolves purge's first argument in one pass: a short number is an amount, anything else a member.
+    Replaces Union[Member, int], which ran MemberConverter (a guild member scan) even for `.purge 50`.
+    """
+    async def convert(self, ctx, argument):
+        if argument.isdecimal() and len(argument) < 15: # User ID snowflakes are 17+ digits; isdecimal() matches what int() accepts
+            return int(argument)
+        return await commands.MemberConverter().convert(ctx, argument)
 
 class Purge(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._usage_cache: dict[tuple[str, str], str] = {}
+
+    def _usage(self, key: str, prefix: str) -> str:
+        """Returns the usage text for `key` rendered with `prefix`, formatting it only on first use."""
+        text = self._usage_cache.get((key, prefix))
+        if text is None:
+            text = self._usage_cache[(key, prefix)] = _USAGE_TEMPLATES[key].format(prefix=prefix)
+        return text
 
     @commands.command(
         name="purge",
@@ -17,10 +58,10 @@ class Purge(commands.Cog):
              "▶ Purge messages from anyone in the channel:\n"
              "   `.purge <amount>`\n"
              "   Example: `.purge 25`\n\n"
-             "Amount should be between 1 and 100."
+             f"Amount should be between 1 and {PURGE_MAX}."
     )
     @commands.has_permissions(manage_messages=True)
-    async def purge(self, ctx, target: typing.Union[discord.Member, int], amount_for_user: typing.Optional[int] = None):
+    async def purge(self, ctx, target: PurgeTarget, amount_for_user: typing.Optional[int] = None):
         user_to_purge: typing.Optional[discord.Member] = None
         num_to_delete: int = 0
 
@@ -29,7 +70,7 @@ class Purge(commands.Cog):
             user_to_purge = target
             if amount_for_user is None:
                 await ctx.send(f"Please specify how many messages to delete from {user_to_purge.mention}.\n"
-                               f"Usage: `{ctx.prefix}purge {user_to_purge.mention} <amount>`")
+                               f"Usage: `{ctx.prefix}purge {user_to_purge.mention} <amount>`", allowed_mentions=_SAFE_MENTIONS)
                 return
             # The converter for Optional[int] handles if amount_for_user is not a valid int when provided.
             # If it's not provided, it's None. If it's provided but not an int, BadArgument is raised.
@@ -39,8 +80,7 @@ class Purge(commands.Cog):
             if amount_for_user is not None:
                 # This means user typed something like ".purge 10 20"
                 # (If they typed ".purge 10 @user", amount_for_user would likely fail conversion to int by discord.py, raising BadArgument)
-                await ctx.send(f"Invalid syntax. To purge messages from anyone, use `{ctx.prefix}purge <amount>` (e.g., `{ctx.prefix}purge 50`).\n"
-                               f"To purge from a user, use `{ctx.prefix}purge @user <amount>`.")
+                await ctx.send(self._usage("invalid_syntax", ctx.prefix), allowed_mentions=_SAFE_MENTIONS)
                 return
             num_to_delete = target
             user_to_purge = None # Explicitly set user to None for general purge
@@ -50,8 +90,8 @@ class Purge(commands.Cog):
             # We can rely on the purge_error handler to inform the user.
             return
 
-        if not (1 <= num_to_delete <= 100):
-            await ctx.send("Please specify an amount to delete between 1 and 100.")
+        if not (1 <= num_to_delete <= PURGE_MAX):
+            await ctx.send(f"Please specify an amount to delete between 1 and {PURGE_MAX}.", allowed_mentions=_SAFE_MENTIONS)
             return
 
         try:
@@ -65,62 +105,57 @@ class Purge(commands.Cog):
                 
                 deleted_messages = await ctx.channel.purge(limit=num_to_delete, check=check_user)
                 deleted_count = len(deleted_messages)
-                await ctx.send(f"Purged {deleted_count} of {user_to_purge.mention}'s messages.", delete_after=5)
+                await ctx.send(f"Purged {deleted_count} of {user_to_purge.mention}'s messages.", delete_after=5, allowed_mentions=_SAFE_MENTIONS)
             else:
                 # General purge
                 deleted_messages = await ctx.channel.purge(limit=num_to_delete)
                 deleted_count = len(deleted_messages)
-                await ctx.send(f"Purged {deleted_count} messages.", delete_after=5)
+                await ctx.send(f"Purged {deleted_count} messages.", delete_after=5, allowed_mentions=_SAFE_MENTIONS)
 
         except discord.Forbidden:
-            await ctx.send("I lack the necessary permissions to delete messages. Please ensure I have 'Manage Messages'.")
+            await ctx.send("I lack the necessary permissions to delete messages. Please ensure I have 'Manage Messages'.", allowed_mentions=_SAFE_MENTIONS)
         except discord.HTTPException as e:
-            await ctx.send(f"An API error occurred while trying to purge messages: {e}")
+            await ctx.send(f"An API error occurred while trying to purge messages: {e}", allowed_mentions=_SAFE_MENTIONS)
         except Exception as e: # Catch any other unexpected errors during purge logic
-            await ctx.send(f"An unexpected error occurred during the purge operation: {e}")
-            print(f"Unexpected error in purge command logic: {e}")
+            await ctx.send(f"An unexpected error occurred during the purge operation: {e}", allowed_mentions=_SAFE_MENTIONS)
+            log.exception("Unexpected error in purge command logic")
 
 
     @purge.error
     async def purge_error(self, ctx, error):
         if isinstance(error, commands.MissingPermissions):
-            await ctx.send("You need the 'Manage Messages' permission to use this command.")
+            await ctx.send("You need the 'Manage Messages' permission to use this command.", allowed_mentions=_SAFE_MENTIONS)
         elif isinstance(error, commands.MissingRequiredArgument):
             if error.param.name == 'target': # This is the first argument (user or amount)
-                await ctx.send(f"You're missing some arguments. Please specify a user and amount, or just an amount.\n"
-                               f"Usage 1: `{ctx.prefix}purge @user <amount>`\n"
-                               f"Usage 2: `{ctx.prefix}purge <amount>`")
+                await ctx.send(self._usage("missing_target", ctx.prefix), allowed_mentions=_SAFE_MENTIONS)
             else: # Should not typically happen with this command structure
-                await ctx.send(f"Missing argument: {error.param.name}. Use `{ctx.prefix}help purge` for info.")
+                await ctx.send(f"Missing argument: {error.param.name}. Use `{ctx.prefix}help purge` for info.", allowed_mentions=_SAFE_MENTIONS)
         
         elif isinstance(error, commands.BadArgument):
             # param.name can help identify which argument failed
             param_name = getattr(error, 'param', None)
-            if param_name and param_name.name == 'target':
-                await ctx.send(f"Invalid first argument. It must be a @user (or user ID) or an amount (a number).\n"
-                               f"Example 1: `{ctx.prefix}purge @SomeUser 50`\n"
-                               f"Example 2: `{ctx.prefix}purge 25`")
+            if (param_name and param_name.name == 'target') or isinstance(error, commands.MemberNotFound):
+                await ctx.send(self._usage("bad_target", ctx.prefix), allowed_mentions=_SAFE_MENTIONS)
             elif param_name and param_name.name == 'amount_for_user':
-                 await ctx.send(f"The amount provided for the user must be a number (1-100).\n"
-                                f"Example: `{ctx.prefix}purge @SomeUser 50`")
+                 await ctx.send(self._usage("bad_amount", ctx.prefix), allowed_mentions=_SAFE_MENTIONS)
             else: # More generic if specific parameter can't be identified
                  await ctx.send(f"Invalid argument: {error}. Please check the command syntax.\n"
                                 f"Usage 1: `{ctx.prefix}purge @user <amount>`\n"
-                                f"Usage 2: `{ctx.prefix}purge <amount>`")
+                                f"Usage 2: `{ctx.prefix}purge <amount>`", allowed_mentions=_SAFE_MENTIONS)
 
         elif isinstance(error, commands.CommandInvokeError):
             original_error = error.original
             if isinstance(original_error, discord.Forbidden):
-                await ctx.send("I lack permissions to perform this action (e.g., 'Manage Messages' or role hierarchy issues).")
+                await ctx.send("I lack permissions to perform this action (e.g., 'Manage Messages' or role hierarchy issues).", allowed_mentions=_SAFE_MENTIONS)
             elif isinstance(original_error, discord.HTTPException):
                 # This can happen for various reasons, e.g., trying to bulk delete messages older than 14 days.
-                await ctx.send(f"An API error occurred: {original_error.text if hasattr(original_error, 'text') else 'Could not complete the action.'}")
+                await ctx.send(f"An API error occurred: {original_error.text if hasattr(original_error, 'text') else 'Could not complete the action.'}", allowed_mentions=_SAFE_MENTIONS)
             else:
-                print(f"An unhandled error occurred in purge command (Invoke): {original_error}")
-                await ctx.send("An unexpected error occurred during command execution.")
+                log.error("An unhandled error occurred in purge command (Invoke): %s", original_error, exc_info=original_error)
+                await ctx.send("An unexpected error occurred during command execution.", allowed_mentions=_SAFE_MENTIONS)
         else:
-            print(f"An unhandled error occurred in purge command: {error}")
-            await ctx.send("An unexpected error occurred. Please check the logs.")
+            log.error("An unhandled error occurred in purge command: %s", error)
+            await ctx.send("An unexpected error occurred. Please check the logs.", allowed_mentions=_SAFE_MENTIONS)
 
 async def setup(bot):
     await bot.add_cog(Purge(bot))
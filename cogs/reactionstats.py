@@ -1,13 +1,93 @@
 import discord
 from discord.ext import commands, tasks
+import asyncio
 import datetime
+import heapq
 import psycopg2
 import psycopg2.extras # For dictionary cursor
+import psycopg2.pool
+import contextlib
+import functools
 import os
+import time
 import traceback
 from typing import Optional, List, Dict, Union, Tuple
 from urllib.parse import urlparse
-from collections import Counter
+from collections import Counter, OrderedDict
+
+DB_POOL_MIN, DB_POOL_MAX = 2, 10 # Pooled connections; DB worker threads are capped at DB_POOL_MAX too
+REACTION_FLUSH_SECONDS = 1.0 # How often buffered reaction inserts/removals are written
+REACTION_FLUSH_SIZE = 200 # Flush early once this many writes are buffered
+INSERT_PAGE_SIZE = 500 # Rows per multi-row INSERT/DELETE statement
+AUTHOR_CACHE_SIZE = 4096 # message_id -> author_id entries kept to skip fetch_message
+SEEN_REACTION_CACHE_SIZE = 50000 # Reactions known to be stored, so repeated add events skip the DB
+SEEN_REACTION_TTL = 3600.0 # Seconds before a seen reaction is trusted to the DB again
+
+# emoji_key identifies an emoji with one column: the custom emoji id as text, else the unicode emoji.
+# current_reactions stores it as a generated column; _emoji_key computes the same value in Python.
+_EMOJI_KEY_SQL = "COALESCE(emoji_custom_id::text, emoji_unicode)"
+
+def _emoji_key(emoji_unicode: Optional[str], emoji_custom_id: Optional[int]) -> str:
+    return str(emoji_custom_id) if emoji_custom_id else emoji_unicode
+
+# reaction_counts keeps a running all-time count per (guild, author, emoji) so the "All Time" stats
+# read a handful of rows instead of aggregating a user's whole history. Every statement that adds
+# or removes current_reactions rows adjusts it in the same statement via RETURNING.
+_INSERT_REACTIONS_SQL = """
+    WITH inserted AS (
+        INSERT INTO current_reactions 
+        (guild_id, message_id, message_author_id, reactor_id, 
+         emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated)
+        VALUES %s
+        ON CONFLICT (message_id, reactor_id, emoji_key) DO NOTHING
+        RETURNING guild_id, message_author_id, emoji_key, emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated
+    )
+    INSERT INTO reaction_counts AS rc
+    (guild_id, message_author_id, emoji_key, emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated, reaction_count)
+    SELECT guild_id, message_author_id, emoji_key, MAX(emoji_unicode), MAX(emoji_custom_id),
+           MAX(emoji_custom_name), BOOL_OR(emoji_is_animated), COUNT(*)
+    FROM inserted
+    GROUP BY guild_id, message_author_id, emoji_key
+    ON CONFLICT (guild_id, message_author_id, emoji_key)
+    DO UPDATE SET reaction_count = rc.reaction_count + EXCLUDED.reaction_count; 
+"""
+
+def _delete_and_count_sql(where_sql: str) -> str:
+    """DELETE from current_reactions and subtract the removed rows from reaction_counts in one statement."""
+    return f"""
+        WITH deleted AS (
+            DELETE FROM current_reactions
+            WHERE {where_sql}
+            RETURNING guild_id, message_author_id, emoji_key
+        )
+        UPDATE reaction_counts AS rc SET reaction_count = rc.reaction_count - d.removed
+        FROM (SELECT guild_id, message_author_id, emoji_key, COUNT(*) AS removed FROM deleted GROUP BY 1, 2, 3) AS d
+        WHERE rc.guild_id = d.guild_id AND rc.message_author_id = d.message_author_id AND rc.emoji_key = d.emoji_key;
+    """
+
+# Rows are (message_id, reactor_id, emoji_key); matched through uq_current_reactions_emoji_key
+_DELETE_REACTIONS_SQL = _delete_and_count_sql("(message_id, reactor_id, emoji_key) IN (VALUES %s)")
+_DELETE_MESSAGE_REACTIONS_SQL = _delete_and_count_sql("message_id = ANY(%s) AND guild_id = %s")
+
+STATS_PERIODS = ("Last 24 Hours", "Last 7 Days", "All Time")
+
+def _top_by(rows, count_key: str, limit: int = 3) -> List[Dict]:
+    """Top `limit` rows by `count_key` (zero counts skipped), exposing that count as 'reaction_count' for the formatters."""
+    top = heapq.nlargest(limit, (r for r in rows if r[count_key]), key=lambda r: r[count_key])
+    return [dict(r, reaction_count=r[count_key]) for r in top]
+
+def _db_errors_return(default=None):
+    """Wraps a blocking DB helper: psycopg2 and pool errors are printed and `default` is returned instead."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            try:
+                return func(self, *args)
+            except (psycopg2.Error, ConnectionError) as e:
+                print(f"ERROR [ReactionStats {func.__name__}]: DB error: {e}")
+                return default
+        return wrapper
+    return decorator
 
 class ReactionStats(commands.Cog):
     """
@@ -19,14 +99,45 @@ class ReactionStats(commands.Cog):
         
         self.db_url = os.getenv("DATABASE_URL")
         self.db_params = None
+        self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+        self._db_sem = asyncio.Semaphore(DB_POOL_MAX)
+        # Buffered writes keyed by (message_id, reactor_id, emoji_unicode, emoji_custom_id). An add
+        # cancels a pending removal of the same reaction and vice versa, so the two never overlap;
+        # _write_lock keeps flushes and message deletes in event order.
+        self._pending_adds: Dict[Tuple, tuple] = {}
+        self._pending_removes: set[Tuple] = set()
+        self._write_lock = asyncio.Lock()
+        self._author_cache: "OrderedDict[int, int]" = OrderedDict()
+        # Reaction keys flushed successfully -> monotonic expiry. Entries for deleted messages are left
+        # to age out, since a deleted message gets no further reaction events.
+        self._seen_reactions: "OrderedDict[Tuple, float]" = OrderedDict()
         if self.db_url:
             self.db_params = self._parse_db_url(self.db_url)
-            self._init_db()
         else:
             print("ERROR [ReactionStats Init]: DATABASE_URL environment variable not set. Cog will not function with DB.")
         
         print("[ReactionStats DEBUG] Cog initialized.")
 
+    async def cog_load(self):
+        if not self.db_params: return
+        # Pool setup and the schema migrations (table rewrites, dedup, index builds) can take a long
+        # time on a large table; run them in a worker thread so the gateway heartbeat keeps going.
+        if await asyncio.to_thread(self._init_db):
+            self._flush_reactions.start()
+        else:
+            if self._pool:
+                self._pool.closeall()
+                self._pool = None
+            self.db_params = None
+            print("ERROR [ReactionStats cog_load]: DB init failed. Cog will not function with DB.")
+
+    async def cog_unload(self):
+        self._flush_reactions.cancel()
+        await self._flush_pending_writes()
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
+
     def _parse_db_url(self, url: str) -> Optional[dict]:
         try:
             parsed = urlparse(url)
@@ -40,200 +151,344 @@ class ReactionStats(commands.Cog):
             print(f"ERROR [ReactionStats _parse_db_url]: Failed to parse DATABASE_URL: {e}")
             return None
 
-    def _get_db_connection(self):
-        if not self.db_params: raise ConnectionError("DB params not configured.")
+    @contextlib.contextmanager
+    def _conn(self):
+        """
+        Borrows a connection from the cog's pool instead of reconnecting (TCP+TLS+auth) per event.
+        The pool rolls back any transaction left open when the connection is returned.
+        """
+        if not self._pool: raise ConnectionError("DB pool not configured.")
+        conn = self._pool.getconn()
         try:
-            return psycopg2.connect(**self.db_params)
-        except psycopg2.Error as e:
-            print(f"ERROR [ReactionStats _get_db_connection]: DB connection failed: {e}")
-            raise ConnectionError(f"Failed to connect to DB: {e}")
+            yield conn
+        finally:
+            self._pool.putconn(conn, close=bool(conn.closed))
 
-    def _init_db(self):
-        if not self.db_params: return
-        conn = None
+    def _init_db(self) -> bool:
+        """Creates the connection pool and brings the schema up to date. Blocking; returns whether it succeeded."""
+        if not self.db_params: return False
         try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS current_reactions (
-                    id SERIAL PRIMARY KEY,
-                    guild_id BIGINT NOT NULL,
-                    channel_id BIGINT NOT NULL,
-                    message_id BIGINT NOT NULL,
-                    message_author_id BIGINT NOT NULL,
-                    reactor_id BIGINT NOT NULL,
-                    emoji_unicode TEXT,
-                    emoji_custom_id BIGINT,
-                    emoji_custom_name TEXT,
-                    emoji_is_animated BOOLEAN,
-                    reacted_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE (message_id, reactor_id, emoji_unicode, emoji_custom_id)
-                )
-            """)
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_current_reactions_author_time ON current_reactions (message_author_id, reacted_at);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_current_reactions_message_id ON current_reactions (message_id);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_current_reactions_emoji ON current_reactions (emoji_unicode, emoji_custom_id);")
-            conn.commit()
-            cursor.close()
-            print("[ReactionStats DEBUG] 'current_reactions' table checked/created.")
+            self._pool = psycopg2.pool.ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, **self.db_params)
+        except psycopg2.Error as e:
+            print(f"ERROR [ReactionStats _init_db]: DB connection pool failed: {e}")
+            return False
+        try:
+            with self._conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS current_reactions (
+                        id SERIAL PRIMARY KEY,
+                        guild_id BIGINT NOT NULL,
+                        message_id BIGINT NOT NULL,
+                        message_author_id BIGINT NOT NULL,
+                        reactor_id BIGINT NOT NULL,
+                        emoji_unicode TEXT,
+                        emoji_custom_id BIGINT,
+                        emoji_custom_name TEXT,
+                        emoji_is_animated BOOLEAN,
+                        reacted_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+                        UNIQUE (message_id, reactor_id, emoji_unicode, emoji_custom_id)
+                    )
+                """)
+                # channel_id was stored on every row but never read
+                cursor.execute("ALTER TABLE current_reactions DROP COLUMN IF EXISTS channel_id;")
+                cursor.execute(f"ALTER TABLE current_reactions ADD COLUMN IF NOT EXISTS emoji_key TEXT GENERATED ALWAYS AS ({_EMOJI_KEY_SQL}) STORED;")
+                cursor.execute("SELECT to_regclass('reaction_counts') IS NULL;")
+                counts_missing = cursor.fetchone()[0]
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS reaction_counts (
+                        guild_id BIGINT NOT NULL,
+                        message_author_id BIGINT NOT NULL,
+                        emoji_key TEXT NOT NULL,
+                        emoji_unicode TEXT,
+                        emoji_custom_id BIGINT,
+                        emoji_custom_name TEXT,
+                        emoji_is_animated BOOLEAN,
+                        reaction_count BIGINT NOT NULL DEFAULT 0,
+                        PRIMARY KEY (guild_id, message_author_id, emoji_key)
+                    )
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_reaction_counts_emoji ON reaction_counts (guild_id, emoji_key, reaction_count DESC);")
+                if counts_missing:
+                    # First run with the aggregate table: seed it from the existing rows once
+                    cursor.execute("""
+                        INSERT INTO reaction_counts
+                        (guild_id, message_author_id, emoji_key, emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated, reaction_count)
+                        SELECT guild_id, message_author_id, emoji_key, MAX(emoji_unicode), MAX(emoji_custom_id),
+                               MAX(emoji_custom_name), BOOL_OR(emoji_is_animated), COUNT(*)
+                        FROM current_reactions
+                        GROUP BY guild_id, message_author_id, emoji_key;
+                    """)
+                cursor.execute("SELECT to_regclass('uq_current_reactions_emoji_key') IS NULL;")
+                if cursor.fetchone()[0]:
+                    # The table's UNIQUE never fires (one of emoji_unicode/emoji_custom_id is always NULL), so
+                    # duplicates may exist; drop them (keeping the oldest, adjusting counts) before enforcing it on emoji_key.
+                    cursor.execute(_delete_and_count_sql("""
+                        id IN (SELECT id FROM (
+                            SELECT id, ROW_NUMBER() OVER (PARTITION BY message_id, reactor_id, emoji_key ORDER BY id) AS rn
+                            FROM current_reactions) AS ranked
+                        WHERE rn > 1)"""))
+                    cursor.execute("CREATE UNIQUE INDEX uq_current_reactions_emoji_key ON current_reactions (message_id, reactor_id, emoji_key);")
+                # Covering indexes for the day/week queries: both filter on guild + author/emoji + reacted_at and
+                # read only the INCLUDEd columns, so Postgres can answer them with index-only scans.
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_current_reactions_author_key_cov ON current_reactions
+                    (message_author_id, guild_id, reacted_at DESC) INCLUDE (emoji_key, emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated);
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_current_reactions_key_time_cov ON current_reactions
+                    (guild_id, emoji_key, reacted_at DESC) INCLUDE (message_author_id);
+                """)
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_current_reactions_message_id ON current_reactions (message_id);")
+                # Superseded by the emoji_key indexes above
+                for old_index in ("idx_current_reactions_author_time", "idx_current_reactions_emoji"):
+                    cursor.execute(f"DROP INDEX IF EXISTS {old_index};")
+                conn.commit()
+                cursor.close()
+                print("[ReactionStats DEBUG] 'current_reactions' and 'reaction_counts' tables checked/created.")
+                return True
         except (psycopg2.Error, ConnectionError) as e:
             print(f"ERROR [ReactionStats _init_db]: DB table init failed: {e}")
-        finally:
-            if conn: conn.close()
+            return False
+
+    async def _run_db(self, func, *args):
+        """
+        Runs a blocking psycopg2 helper in a worker thread so queries never stall the gateway.
+        At most DB_POOL_MAX run at once, so a reaction storm queues here instead of exhausting
+        the pool or the default thread executor.
+        """
+        async with self._db_sem:
+            return await asyncio.to_thread(func, *args)
 
     async def _get_message_author_id(self, payload: discord.RawReactionActionEvent) -> Optional[int]:
-        channel = self.bot.get_channel(payload.channel_id)
-        if not channel or not isinstance(channel, discord.abc.Messageable): return None
-        try:
-            message = await channel.fetch_message(payload.message_id)
-            return message.author.id
-        except (discord.NotFound, discord.Forbidden): pass
-        except Exception as e: print(f"[ReactionStats DEBUG] Error fetching message {payload.message_id}: {e}")
-        return None
+        """
+        Resolves the reacted message's author: the gateway-supplied id, the LRU cache,
+        the bot's message cache, then one HTTP fetch.
+        """
+        # Reaction-add events carry message_author_id (discord.py 2.4+), so the usual path needs no lookup at all
+        author_id = getattr(payload, 'message_author_id', None)
+        if author_id:
+            return author_id
+        author_id = self._author_cache.get(payload.message_id)
+        if author_id is not None:
+            self._author_cache.move_to_end(payload.message_id)
+            return author_id
+        message = discord.utils.get(self.bot.cached_messages, id=payload.message_id)
+        if message is None:
+            channel = self.bot.get_channel(payload.channel_id)
+            if not channel or not isinstance(channel, discord.abc.Messageable): return None
+            try:
+                message = await channel.fetch_message(payload.message_id)
+            except (discord.NotFound, discord.Forbidden): return None
+            except Exception as e: print(f"[ReactionStats DEBUG] Error fetching message {payload.message_id}: {e}"); return None
+        self._author_cache[payload.message_id] = message.author.id
+        if len(self._author_cache) > AUTHOR_CACHE_SIZE:
+            self._author_cache.popitem(last=False)
+        return message.author.id
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
         if not self.db_params or not payload.guild_id or payload.user_id == self.bot.user.id: return
+        emoji = payload.emoji
+        is_custom = emoji.is_custom_emoji()
+        key = (
+            payload.message_id, payload.user_id,
+            None if is_custom else emoji.name,
+            emoji.id if is_custom else None
+        )
+        # Already stored: skip the author lookup and the INSERT's conflict probe entirely
+        if self._is_seen_reaction(key): return
         message_author_id = await self._get_message_author_id(payload)
         if not message_author_id: return 
 
-        emoji = payload.emoji
-        sql = """
-            INSERT INTO current_reactions 
-            (guild_id, channel_id, message_id, message_author_id, reactor_id, 
-             emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated, reacted_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (message_id, reactor_id, emoji_unicode, emoji_custom_id) DO NOTHING; 
-        """
         params = (
-            payload.guild_id, payload.channel_id, payload.message_id, message_author_id, payload.user_id,
-            emoji.name if not emoji.is_custom_emoji() else None,
-            emoji.id if emoji.is_custom_emoji() else None,
-            emoji.name if emoji.is_custom_emoji() else None,
-            emoji.animated if emoji.is_custom_emoji() else None,
-            datetime.datetime.now(datetime.timezone.utc)
+            payload.guild_id, payload.message_id, message_author_id, payload.user_id,
+            key[2], key[3],
+            emoji.name if is_custom else None,
+            emoji.animated if is_custom else None
         )
-        conn = None
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor(); cursor.execute(sql, params); conn.commit(); cursor.close()
-        except (psycopg2.Error, ConnectionError) as e: print(f"ERROR [ReactionStats on_raw_reaction_add]: DB error: {e}")
-        finally:
-            if conn: conn.close()
+        # Written by _flush_reactions as one multi-row INSERT instead of a round-trip per reaction
+        self._pending_removes.discard(key)
+        self._pending_adds[key] = params
+        await self._maybe_flush()
+
+    def _is_seen_reaction(self, key: Tuple) -> bool:
+        expires_at = self._seen_reactions.get(key)
+        if expires_at is None: return False
+        if expires_at < time.monotonic():
+            del self._seen_reactions[key]
+            return False
+        return True
+
+    def _mark_reactions_seen(self, keys):
+        expires_at = time.monotonic() + SEEN_REACTION_TTL
+        for key in keys:
+            self._seen_reactions[key] = expires_at
+            self._seen_reactions.move_to_end(key)
+        while len(self._seen_reactions) > SEEN_REACTION_CACHE_SIZE:
+            self._seen_reactions.popitem(last=False)
+
+    async def _maybe_flush(self):
+        # While a flush is in flight the loop picks the rest up; don't queue more behind the lock
+        if self._write_lock.locked(): return
+        if len(self._pending_adds) + len(self._pending_removes) >= REACTION_FLUSH_SIZE:
+            await self._flush_pending_writes()
+
+    @tasks.loop(seconds=REACTION_FLUSH_SECONDS)
+    async def _flush_reactions(self):
+        await self._flush_pending_writes()
+
+    async def _flush_pending_writes(self):
+        if not self._pending_adds and not self._pending_removes: return
+        async with self._write_lock:
+            remove_keys = list(self._pending_removes)
+            adds = list(self._pending_adds.items())
+            self._pending_removes.clear()
+            self._pending_adds.clear()
+            if remove_keys or adds:
+                removes = [(m, r, _emoji_key(u, c)) for m, r, u, c in remove_keys]
+                written = await self._run_db(self._write_reactions_sync, removes, [params for _, params in adds])
+                if written:
+                    # A reaction removed again while the batch was in flight is not stored for long
+                    self._mark_reactions_seen(key for key, _ in adds if key not in self._pending_removes)
+                else:
+                    self._requeue_failed_writes(remove_keys, adds)
+
+    def _requeue_failed_writes(self, remove_keys: List[Tuple], adds: List[Tuple[Tuple, tuple]]):
+        """
+        Puts a batch that failed to write back into the buffers for the next flush. A key that saw
+        a newer add or remove while the batch was in flight keeps that newer entry.
+        """
+        for key in remove_keys:
+            if key not in self._pending_adds:
+                self._pending_removes.add(key)
+        for key, params in adds:
+            if key not in self._pending_adds and key not in self._pending_removes:
+                self._pending_adds[key] = params
+
+    @_db_errors_return(False)
+    def _write_reactions_sync(self, removes: List[tuple], adds: List[tuple]) -> bool:
+        """Applies a flushed batch in one transaction: one DELETE ... IN (VALUES ...) and one multi-row INSERT."""
+        with self._conn() as conn, conn.cursor() as cursor:
+            if removes: psycopg2.extras.execute_values(cursor, _DELETE_REACTIONS_SQL, removes, page_size=INSERT_PAGE_SIZE)
+            if adds: psycopg2.extras.execute_values(cursor, _INSERT_REACTIONS_SQL, adds, page_size=INSERT_PAGE_SIZE)
+            conn.commit()
+        return True
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
         if not self.db_params or not payload.guild_id or payload.user_id == self.bot.user.id: return
         emoji = payload.emoji
-        sql = """
-            DELETE FROM current_reactions 
-            WHERE message_id = %s AND reactor_id = %s 
-            AND ( (emoji_unicode = %s AND emoji_custom_id IS NULL) OR (emoji_custom_id = %s AND emoji_unicode IS NULL) );
-        """
-        params = (
+        is_custom = emoji.is_custom_emoji()
+        key = (
             payload.message_id, payload.user_id,
-            emoji.name if not emoji.is_custom_emoji() else None, 
-            emoji.id if emoji.is_custom_emoji() else None       
+            None if is_custom else emoji.name,
+            emoji.id if is_custom else None
         )
-        conn = None
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor(); cursor.execute(sql, params); conn.commit(); cursor.close()
-        except (psycopg2.Error, ConnectionError) as e: print(f"ERROR [ReactionStats on_raw_reaction_remove]: DB error: {e}")
-        finally:
-            if conn: conn.close()
+        # A still-buffered add for the same reaction is simply dropped; the batched DELETE covers a row flushed earlier
+        self._seen_reactions.pop(key, None)
+        self._pending_adds.pop(key, None)
+        self._pending_removes.add(key)
+        await self._maybe_flush()
 
     @commands.Cog.listener()
     async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
         if not self.db_params or not payload.guild_id: return
-        sql = "DELETE FROM current_reactions WHERE message_id = %s AND guild_id = %s;"
-        conn = None
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor(); cursor.execute(sql, (payload.message_id, payload.guild_id)); conn.commit()
-        except (psycopg2.Error, ConnectionError) as e: print(f"ERROR [ReactionStats on_raw_message_delete]: DB error: {e}")
-        finally:
-            if conn: cursor.close(); conn.close()
+        await self._delete_message_reactions({payload.message_id}, payload.guild_id)
             
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
         if not self.db_params or not payload.guild_id or not payload.message_ids: return
-        sql = "DELETE FROM current_reactions WHERE message_id = ANY(%s) AND guild_id = %s;"
-        conn = None
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor(); cursor.execute(sql, (list(payload.message_ids), payload.guild_id)); conn.commit()
-        except (psycopg2.Error, ConnectionError) as e: print(f"ERROR [ReactionStats on_raw_bulk_message_delete]: DB error: {e}")
-        finally:
-            if conn: cursor.close(); conn.close()
+        await self._delete_message_reactions(payload.message_ids, payload.guild_id)
 
-    async def _fetch_top_reactions_for_user_period(self, guild_id: int, member_id: int, start_time: Optional[datetime.datetime]) -> List[Dict]:
-        if not self.db_params: return []
-        time_filter_sql = "AND reacted_at >= %s" if start_time else ""
-        conn = None
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            query = f"""
-                SELECT emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated, COUNT(*) as reaction_count
-                FROM current_reactions
-                WHERE message_author_id = %s AND guild_id = %s {time_filter_sql}
-                GROUP BY emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated
-                ORDER BY reaction_count DESC LIMIT 3; 
-            """
-            params = [member_id, guild_id]
-            if start_time: params.append(start_time)
-            cursor.execute(query, tuple(params)); return cursor.fetchall()
-        except (psycopg2.Error, ConnectionError) as e: print(f"ERROR [ReactionStats _fetch_top_reactions_for_user_period]: DB error: {e}"); return []
-        finally:
-            if conn: cursor.close(); conn.close()
+    async def _delete_message_reactions(self, message_ids: set[int], guild_id: int):
+        for message_id in message_ids:
+            self._author_cache.pop(message_id, None)
+        for key in [k for k in self._pending_adds if k[0] in message_ids]:
+            del self._pending_adds[key]
+        self._pending_removes = {k for k in self._pending_removes if k[0] not in message_ids}
+        async with self._write_lock:
+            # psycopg2 adapts lists (not sets) to a bigint[] for ANY(%s), served by idx_current_reactions_message_id
+            await self._run_db(self._delete_message_reactions_sync, list(message_ids), guild_id)
+
+    @_db_errors_return()
+    def _delete_message_reactions_sync(self, message_ids: List[int], guild_id: int):
+        """Drops every stored reaction on the given messages (single and bulk message deletes)."""
+        with self._conn() as conn, conn.cursor() as cursor:
+            cursor.execute(_DELETE_MESSAGE_REACTIONS_SQL, (message_ids, guild_id)); conn.commit()
+
+    async def _fetch_top_reactions_for_user(self, guild_id: int, member_id: int, day_start: datetime.datetime, week_start: datetime.datetime) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Top reactions for each of STATS_PERIODS, fetched in one worker call on one pooled connection."""
+        if not self.db_params: return [], [], []
+        return await self._run_db(self._fetch_top_reactions_sync, guild_id, member_id, day_start, week_start)
 
-    def _format_reactions_list_for_embed_field(self, reactions_data: List[Dict]) -> str:
+    @_db_errors_return(([], [], []))
+    def _fetch_top_reactions_sync(self, guild_id: int, member_id: int, day_start: datetime.datetime, week_start: datetime.datetime) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        # Day and week come from one scan of the last week using FILTER; all-time from the aggregate
+        windowed_query = """
+            SELECT MAX(emoji_unicode) AS emoji_unicode, MAX(emoji_custom_id) AS emoji_custom_id,
+                   MAX(emoji_custom_name) AS emoji_custom_name, BOOL_OR(emoji_is_animated) AS emoji_is_animated,
+                   COUNT(*) FILTER (WHERE reacted_at >= %s) AS day_count, COUNT(*) AS week_count
+            FROM current_reactions
+            WHERE message_author_id = %s AND guild_id = %s AND reacted_at >= %s
+            GROUP BY emoji_key;
+        """
+        all_time_query = """
+            SELECT emoji_unicode, emoji_custom_id, emoji_custom_name, emoji_is_animated, reaction_count
+            FROM reaction_counts
+            WHERE message_author_id = %s AND guild_id = %s AND reaction_count > 0
+            ORDER BY reaction_count DESC LIMIT 3;
+        """
+        with self._conn() as conn, conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
+            cursor.execute(windowed_query, (day_start, member_id, guild_id, week_start)); windowed = cursor.fetchall()
+            cursor.execute(all_time_query, (member_id, guild_id)); all_time = cursor.fetchall()
+        return _top_by(windowed, 'day_count'), _top_by(windowed, 'week_count'), all_time
+
+    def _format_reactions_list_for_embed_field(self, reactions_data: List[Dict], emoji_map: Dict[int, str]) -> str:
+        """`emoji_map` maps custom emoji ids to their rendered form; ids not in it use the stored name."""
         if not reactions_data: return "No reactions found in this period."
         lines = []
         for i, row in enumerate(reactions_data):
             emoji_display = ""
             if row['emoji_custom_id']:
-                custom_emoji = self.bot.get_emoji(row['emoji_custom_id'])
-                if custom_emoji: emoji_display = str(custom_emoji)
-                else: emoji_display = f"<:{row['emoji_custom_name']}:{row['emoji_custom_id']}>" if not row['emoji_is_animated'] else f"<a:{row['emoji_custom_name']}:{row['emoji_custom_id']}>"
+                emoji_display = emoji_map.get(row['emoji_custom_id'])
+                if not emoji_display: emoji_display = f"<:{row['emoji_custom_name']}:{row['emoji_custom_id']}>" if not row['emoji_is_animated'] else f"<a:{row['emoji_custom_name']}:{row['emoji_custom_id']}>"
             elif row['emoji_unicode']: emoji_display = row['emoji_unicode']
             lines.append(f"{i+1}. {emoji_display} - **{row['reaction_count']}**")
         return "\n".join(lines)
 
-    async def _fetch_emoji_leaderboard_for_period(self, guild_id: int, emoji_unicode: Optional[str], emoji_custom_id: Optional[int], start_time: Optional[datetime.datetime]) -> List[Dict]:
-        if not self.db_params: return []
-        time_filter_sql = "AND reacted_at >= %s" if start_time else ""
+    async def _fetch_emoji_leaderboard(self, guild_id: int, emoji_unicode: Optional[str], emoji_custom_id: Optional[int], day_start: datetime.datetime, week_start: datetime.datetime) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """Emoji leaderboard for each of STATS_PERIODS, fetched in one worker call on one pooled connection."""
+        if not self.db_params: return [], [], []
+        return await self._run_db(self._fetch_emoji_leaderboard_sync, guild_id, emoji_unicode, emoji_custom_id, day_start, week_start)
+
+    @_db_errors_return(([], [], []))
+    def _fetch_emoji_leaderboard_sync(self, guild_id: int, emoji_unicode: Optional[str], emoji_custom_id: Optional[int], day_start: datetime.datetime, week_start: datetime.datetime) -> Tuple[List[Dict], List[Dict], List[Dict]]:
         if emoji_unicode and emoji_custom_id: 
             print("[ReactionStats DEBUG] Both unicode and custom_id provided to _fetch_emoji_leaderboard. Prioritizing unicode.")
             emoji_custom_id = None
         
-        emoji_filter_sql = "AND emoji_unicode = %s AND emoji_custom_id IS NULL" if emoji_unicode else "AND emoji_custom_id = %s AND emoji_unicode IS NULL"
-        
-        conn = None
-        try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
-            query = f"""
-                SELECT message_author_id, COUNT(*) as reaction_count
-                FROM current_reactions
-                WHERE guild_id = %s {emoji_filter_sql} {time_filter_sql}
-                GROUP BY message_author_id
-                ORDER BY reaction_count DESC
-                LIMIT 3;
-            """
-            params = [guild_id]
-            if emoji_unicode: params.append(emoji_unicode)
-            elif emoji_custom_id: params.append(emoji_custom_id)
-            else: return [] 
-            
-            if start_time: params.append(start_time)
-            
-            cursor.execute(query, tuple(params))
-            return cursor.fetchall() 
-        except (psycopg2.Error, ConnectionError) as e: print(f"ERROR [ReactionStats _fetch_emoji_leaderboard_for_period]: DB error: {e}"); return []
-        finally:
-            if conn: cursor.close(); conn.close()
+        if not emoji_unicode and not emoji_custom_id: return [], [], []
+
+        emoji_key = _emoji_key(emoji_unicode, emoji_custom_id)
+        windowed_query = """
+            SELECT message_author_id,
+                   COUNT(*) FILTER (WHERE reacted_at >= %s) AS day_count, COUNT(*) AS week_count
+            FROM current_reactions
+            WHERE guild_id = %s AND emoji_key = %s AND reacted_at >= %s
+            GROUP BY message_author_id;
+        """
+        all_time_query = """
+            SELECT message_author_id, reaction_count
+            FROM reaction_counts
+            WHERE guild_id = %s AND emoji_key = %s AND reaction_count > 0
+            ORDER BY reaction_count DESC
+            LIMIT 3;
+        """
+        with self._conn() as conn, conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
+            cursor.execute(windowed_query, (day_start, guild_id, emoji_key, week_start)); windowed = cursor.fetchall()
+            cursor.execute(all_time_query, (guild_id, emoji_key)); all_time = cursor.fetchall()
+        return _top_by(windowed, 'day_count'), _top_by(windowed, 'week_count'), all_time
 
     def _format_leaderboard_for_embed_field(self, leaderboard_data: List[Dict], guild: discord.Guild, target_emoji_str: str) -> str: # Added target_emoji_str
         if not leaderboard_data: return "No users found for this emoji in this period."
@@ -257,11 +512,6 @@ class ReactionStats(commands.Cog):
         if not self.db_params: await ctx.send("Database not configured."); return
         target_member = member or ctx.author
         now = datetime.datetime.now(datetime.timezone.utc)
-        timeframes = {
-            "Last 24 Hours": now - datetime.timedelta(days=1),
-            "Last 7 Days": now - datetime.timedelta(days=7),
-            "All Time": None
-        }
         utils_cog = self.bot.get_cog('Utils')
         embed_title = f"Top Reactions Received by {target_member.display_name}"
         embed = utils_cog.create_embed(ctx, title=embed_title, description="", color=discord.Color.purple()) if utils_cog \
@@ -269,10 +519,13 @@ class ReactionStats(commands.Cog):
         if not utils_cog: embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.display_avatar.url if ctx.author.avatar else None)
 
         any_data_found = False
-        for period_name, start_time_obj in timeframes.items():
-            reactions_data = await self._fetch_top_reactions_for_user_period(ctx.guild.id, target_member.id, start_time_obj)
+        reactions_by_period = await self._fetch_top_reactions_for_user(ctx.guild.id, target_member.id, now - datetime.timedelta(days=1), now - datetime.timedelta(days=7))
+        # Each custom emoji is looked up and rendered once, however many periods list it
+        custom_ids = {row['emoji_custom_id'] for rows in reactions_by_period for row in rows if row['emoji_custom_id']}
+        emoji_map = {emoji_id: str(emoji) for emoji_id in custom_ids if (emoji := self.bot.get_emoji(emoji_id))}
+        for period_name, reactions_data in zip(STATS_PERIODS, reactions_by_period):
             if reactions_data: any_data_found = True
-            field_value = self._format_reactions_list_for_embed_field(reactions_data) # Pass period_name for consistency if needed by formatter
+            field_value = self._format_reactions_list_for_embed_field(reactions_data, emoji_map)
             embed.add_field(name=f"{period_name}", value=field_value, inline=False)
         if not any_data_found and not embed.fields: embed.description = "No reactions found for this user."
         await ctx.send(embed=embed)
@@ -311,11 +564,6 @@ class ReactionStats(commands.Cog):
             return
 
         now = datetime.datetime.now(datetime.timezone.utc)
-        timeframes = {
-            "Last 24 Hours": now - datetime.timedelta(days=1),
-            "Last 7 Days": now - datetime.timedelta(days=7),
-            "All Time": None
-        }
         utils_cog = self.bot.get_cog('Utils')
         
         embed_title = f"Leaderboard for {target_emoji_display} Reaction"
@@ -324,8 +572,8 @@ class ReactionStats(commands.Cog):
         if not utils_cog: embed.set_footer(text=f"Requested by {ctx.author.name}", icon_url=ctx.author.display_avatar.url if ctx.author.avatar else None)
 
         any_data_found = False
-        for period_name, start_time_obj in timeframes.items():
-            leaderboard_data = await self._fetch_emoji_leaderboard_for_period(ctx.guild.id, emoji_unicode_arg, emoji_custom_id_arg, start_time_obj)
+        leaderboard_by_period = await self._fetch_emoji_leaderboard(ctx.guild.id, emoji_unicode_arg, emoji_custom_id_arg, now - datetime.timedelta(days=1), now - datetime.timedelta(days=7))
+        for period_name, leaderboard_data in zip(STATS_PERIODS, leaderboard_by_period):
             if leaderboard_data: any_data_found = True
             # Pass the target_emoji_display to the formatter
             field_value = self._format_leaderboard_for_embed_field(leaderboard_data, ctx.guild, target_emoji_display)
@@ -2,6 +2,9 @@ import discord
 from discord.ext import commands
 import os
 import asyncio
+import logging
+import logging.handlers
+import queue
 import traceback
 
 # Initialize bot with . prefix, intents, and no default help command
@@ -47,6 +50,16 @@ async def on_ready():
     print(f'Discord.py Version: {discord.__version__}')
     await load_cogs() # Call the updated load_cogs
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """Routes log records through a queue so handler I/O happens off the event loop thread."""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener.start()
+    return listener
+
 # Run bot
 async def main():
     # from dotenv import load_dotenv # If using dotenv for local dev
@@ -56,6 +69,7 @@ async def main():
         print("ERROR: DISCORD_BOT_TOKEN environment variable not set.")
         return
     
+    log_listener = setup_logging()
     try:
         await bot.start(token)
     except discord.LoginFailure:
@@ -63,6 +77,8 @@ async def main():
     except Exception as e:
         print(f"ERROR: An unexpected error occurred during bot startup: {e}")
         traceback.print_exc()
+    finally:
+        log_listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(main())